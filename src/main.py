@@ -24,25 +24,54 @@ OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 import argparse
-import json
+import mmap
 import os
-import random
-import subprocess
 import sys
+from collections import defaultdict
 from dataclasses import dataclass
-from shutil import which
+from functools import cached_property
 from typing import override
 
 import update
 from update import __print as _print
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None  # type: ignore[assignment]
+
 # the default quote file that is presumed to be present in ../ relative to main.py
 QUOTE_FILE: str = "quotes.json"
 
+# author recorded for quotes that are added without one
+ANONYMOUS: str = "Anonymous"
+
+# buffer size used when writing quote files
+BUFFER_SIZE: int = 131072
+
+# per-user directory for results that are slow to recompute on every run
+CACHE_DIRECTORY: str = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "quote"
+)
+
+# parsed quote files keyed by path, so a single run only parses each file once
+_cache: dict[str, "QuoteStore"] = {}
+
+# cached stores keyed by id() of the quote list each one built, so functions
+# that are only given the list can reuse the results derived from it
+_stores_by_quotes: dict[int, "QuoteStore"] = {}
+
 
 class Parser:
 
-    def __init__(self):
+    def __init__(self) -> None:
+        # plain query and add invocations skip building the argparse parser
+        simple_args = self._parse_simple_args(sys.argv[1:])
+        if simple_args is not None:
+            self.parsers = {}
+            self.args = simple_args
+            return
+
         self.argument_parser = argparse.ArgumentParser()
 
         self.argument_parser.add_argument(
@@ -74,16 +103,90 @@ class Parser:
 
         subparsers = self.argument_parser.add_subparsers(dest="command")
 
-        self.parsers = {
-            "query": subparsers.add_parser("query", help="Query an existing quote"),
-            "add": subparsers.add_parser("add", help="Add a new quote"),
-            "prune": subparsers.add_parser("prune", help="Remove duplicate quotes"),
-            "update": subparsers.add_parser(
-                "update", help="Update to the newest version"
-            ),
+        # only the subcommand being run is built, unless it can't be determined
+        builders = {
+            "query": self._build_query,
+            "add": self._build_add,
+            "prune": self._build_prune,
+            "update": self._build_update,
         }
+        command = self._find_command()
+        selected = [command] if command in builders else list(builders)
+        self.parsers = {name: builders[name](subparsers) for name in selected}
+
+        self.args = self._parse_args()
 
-        query_group = self.parsers["query"].add_mutually_exclusive_group(required=True)
+    @staticmethod
+    def _parse_simple_args(arguments: list[str]) -> argparse.Namespace | None:
+        """
+        Parse the common query and add invocations by hand.
+
+        Returns None for anything else, including help and malformed input, so
+        that argparse handles it and reports errors as usual. This mirrors the
+        options defined in _build_query and _build_add and must be changed
+        along with them.
+        """
+        args = argparse.Namespace(version=False, verbose=False, file=None, qotd=True)
+        arguments = list(arguments)
+        while arguments and arguments[0] in ("--verbose", "--file"):
+            option = arguments.pop(0)
+            if option == "--verbose":
+                args.verbose = True
+            elif arguments and not arguments[0].startswith("-"):
+                args.file = arguments.pop(0)
+            else:
+                return None
+
+        if not arguments:
+            return None
+
+        command, *rest = arguments
+        if command == "query" and rest:
+            args.command = "query"
+            args.author = args.id = None
+            args.list = args.show_duplicates = False
+            if rest == ["--list"]:
+                args.list = True
+                return args
+            if rest == ["--show-duplicates"]:
+                args.show_duplicates = True
+                return args
+            if len(rest) == 2 and not rest[1].startswith("-"):
+                if rest[0] == "--author":
+                    args.author = rest[1]
+                    return args
+                if rest[0] == "--id":
+                    args.id = rest[1]
+                    return args
+        elif command == "add" and rest:
+            args.command = "add"
+            args.author = None
+            if len(rest) == 3 and "--author" in rest[:2]:
+                position = rest.index("--author")
+                args.author = rest.pop(position + 1)
+                del rest[position]
+            values = [*rest, args.author or ""]
+            if len(rest) == 1 and not any(value.startswith("-") for value in values):
+                args.quote = rest[0]
+                return args
+        return None
+
+    @staticmethod
+    def _find_command() -> str | None:
+        """Return the first positional argument, which names the subcommand"""
+        arguments = iter(sys.argv[1:])
+        for argument in arguments:
+            if argument == "--file":
+                next(arguments, None)
+            elif not argument.startswith("-"):
+                return argument
+        return None
+
+    @staticmethod
+    def _build_query(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParser:
+        # _parse_simple_args parses these options by hand and must be kept in step
+        parser = subparsers.add_parser("query", help="Query an existing quote")
+        query_group = parser.add_mutually_exclusive_group(required=True)
 
         query_group.add_argument("--author", help="Quote author")
         query_group.add_argument("--id", help="Quote ID number")
@@ -94,22 +197,36 @@ class Parser:
             help="Show duplicate quotes",
             action="store_true",
         )
-
-        self.parsers["add"].add_argument("--author", dest="author", help="Quote author")
-        self.parsers["add"].add_argument("quote", help="The quote text")
-
-        self.parsers["update"].add_argument(
+        return parser
+
+    @staticmethod
+    def _build_add(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParser:
+        # _parse_simple_args parses these options by hand and must be kept in step
+        parser = subparsers.add_parser("add", help="Add a new quote")
+        parser.add_argument("--author", dest="author", help="Quote author")
+        parser.add_argument("quote", help="The quote text")
+        return parser
+
+    @staticmethod
+    def _build_prune(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParser:
+        return subparsers.add_parser("prune", help="Remove duplicate quotes")
+
+    @staticmethod
+    def _build_update(
+        subparsers: argparse._SubParsersAction,
+    ) -> argparse.ArgumentParser:
+        parser = subparsers.add_parser("update", help="Update to the newest version")
+        parser.add_argument(
             "--force",
             help="Ignore any changes made to source code (DESTRUCTIVE)",
             action="store_true",
         )
-        self.parsers["update"].add_argument(
+        parser.add_argument(
             "--check-dev",
             help="Detect and disable destructive actions in a devenv.",
             action="store_true",
         )
-
-        self.args = self._parse_args()
+        return parser
 
     def _parse_args(self) -> argparse.Namespace:
         if len(sys.argv) != 1:
@@ -119,91 +236,332 @@ class Parser:
             sys.exit()
 
 
-@dataclass
+@dataclass(slots=True)
 class Quote:
 
     identifier: int
     quote: str = ""
-    author: str = "Anonymous"
+    author: str = ANONYMOUS
 
     @override
-    def __str__(self):
+    def __str__(self) -> str:
         return "Quote #{}: {} - {}".format(self.identifier, self.quote, self.author)
 
 
-def file_is_empty(file=QUOTE_FILE) -> bool:
-    return os.stat(file).st_size == 0
+@dataclass
+class QuoteStore:
+    """
+    The parsed contents of a quote file and everything derived from them.
+    Derived values are computed on first use, and the whole store is
+    replaced rather than updated whenever the file changes.
+    """
+
+    data: dict[str, dict]
+    mtime: int
+    quotes_id: int | None = None
+
+    @cached_property
+    def quotes(self) -> list[Quote]:
+        quotes_list = _build_quotes(self.data)
+        self.quotes_id = id(quotes_list)
+        _stores_by_quotes[self.quotes_id] = self
+        return quotes_list
+
+    @cached_property
+    def index(self) -> tuple[dict[int, Quote], dict[str, list[Quote]]]:
+        return _build_index(self.quotes)
+
+    @cached_property
+    def duplicates(self) -> list[Quote]:
+        return _find_duplicates(self.quotes)
+
+
+def _loads(data: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(data)
+
+    import json
+
+    return json.loads(data)
 
 
-def read_json(file=QUOTE_FILE):
-    if not os.path.exists(file):
-        with open(file, "w") as fs:
-            fs.close()
-    elif not file_is_empty(file):
-        with open(file, "r") as reader:
-            contents: dict[int, str] = json.loads(reader.read())
-            return contents
-    return json.loads("{}")
+def _dumps(contents: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(contents)
 
+    import json
 
-def load_quotes(file=QUOTE_FILE) -> list[Quote]:
+    return json.dumps(contents).encode()
+
+
+def _update_cache(file: str, contents: dict, mtime: int | None = None) -> None:
+    """Replace the cached contents of `file` after it has been read or written"""
+    if mtime is None:
+        mtime = os.stat(file).st_mtime_ns
+    previous = _cache.get(file)
+    if previous is not None and previous.quotes_id is not None:
+        del _stores_by_quotes[previous.quotes_id]
+    _cache[file] = QuoteStore(contents, mtime)
+
+
+def _find_store(quotes_list: list[Quote]) -> QuoteStore | None:
+    """Return the cached store `quotes_list` was loaded from, if any"""
+    return _stores_by_quotes.get(id(quotes_list))
+
+
+def read_json(file: str = QUOTE_FILE) -> dict:
+    try:
+        stat = os.stat(file)
+    except FileNotFoundError:
+        # the file is created by the first write, not by reading it
+        return {}
+
+    if stat.st_size == 0:
+        return {}
+
+    store = _cache.get(file)
+    if store is not None and store.mtime == stat.st_mtime_ns:
+        return store.data
+
+    fd = os.open(file, os.O_RDONLY)
+    try:
+        stat = os.fstat(fd)
+        if orjson is not None:
+            # orjson parses the mapped pages directly, without a copy
+            with (
+                mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped,
+                memoryview(mapped) as view,
+            ):
+                contents: dict = orjson.loads(view)
+        else:
+            # the whole file is wanted, so read it with a single read() call
+            contents = _loads(os.read(fd, stat.st_size))
+    finally:
+        os.close(fd)
+
+    _update_cache(file, contents, stat.st_mtime_ns)
+    return contents
+
+
+def write_json(contents: dict, file: str = QUOTE_FILE) -> None:
+    """
+    Serialize `contents` up front and write it in one call to a temporary
+    file, which then replaces `file` so a failed write can't truncate it.
+    The temporary file is removed again if the write fails.
+    """
+    data: bytes = _dumps(contents)
+
+    # replace the file a symlink points at rather than the link itself, and
+    # keep its permissions instead of those a new file would get
+    target = os.path.realpath(file)
+    try:
+        mode: int | None = os.stat(target).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+
+    temporary_file = target + ".tmp"
+    try:
+        with open(temporary_file, "wb", buffering=BUFFER_SIZE) as writer:
+            if mode is not None:
+                os.fchmod(writer.fileno(), mode)
+            writer.write(data)
+        os.replace(temporary_file, target)
+    except BaseException:
+        try:
+            os.remove(temporary_file)
+        except FileNotFoundError:
+            pass
+        raise
+    _update_cache(file, contents)
+
+
+def load_quotes(file: str = QUOTE_FILE) -> list[Quote]:
     contents: dict = read_json(file)
+    store = _cache.get(file)
+    if store is not None and store.data is contents:
+        return store.quotes
+
+    return _build_quotes(contents)
+
+
+def _build_quotes(contents: dict[str, dict]) -> list[Quote]:
+    # authors repeat across quotes, so interning lets them share one string;
+    # quotes added without an author were stored with a null one
     quotes_list: list[Quote] = [
-        Quote(i, contents[i]["quote"], contents[i]["author"]) for i in contents
+        Quote(int(i), entry["quote"], sys.intern(entry["author"] or ANONYMOUS))
+        for i, entry in contents.items()
     ]
     return quotes_list
 
 
+def get_quote(identifier: int, file: str = QUOTE_FILE) -> Quote | None:
+    """Look up a single quote without building a Quote for every entry"""
+    contents: dict = read_json(file)
+    identifier = int(identifier)
+    entry: dict | None = contents.get(str(identifier))
+    if entry is not None:
+        return Quote(identifier, entry["quote"], entry["author"] or ANONYMOUS)
+    return None
+
+
 def random_quote(quotes_list: list[Quote]) -> Quote | None:
-    if len(quotes_list):
-        return random.choice(quotes_list)
+    import random
+
+    quote_count = len(quotes_list)
+    if quote_count:
+        return quotes_list[random.randrange(quote_count)]
+    return None
 
 
-def add_quote(quote: str, author: str, identifier: int, file=QUOTE_FILE):
+def append_json(file: str, key: str, value: dict) -> bool:
+    """
+    Splice `key` into the JSON object stored in `file` by overwriting its
+    closing brace, so only the new entry is written instead of the whole
+    file. Returns False if the end of the object couldn't be located.
+    """
+    record: bytes = _dumps({key: value})[1:-1]
+
+    with open(file, "r+b") as writer:
+        end = writer.seek(0, os.SEEK_END)
+        writer.seek(max(end - 64, 0))
+        tail = writer.read()
+        stripped = tail.rstrip()
+        body = stripped[:-1].rstrip()
+
+        if not stripped.endswith(b"}") or not body:
+            return False
+
+        writer.seek(end - len(tail) + len(stripped) - 1)
+        writer.write(record + b"}" if body.endswith(b"{") else b"," + record + b"}")
+        writer.truncate()
+    return True
+
+
+def add_quote(
+    quote: str, author: str | None, identifier: int, file: str = QUOTE_FILE
+) -> None:
+    key = str(identifier)
+    entry = {"quote": quote, "author": author if author is not None else ANONYMOUS}
+
+    # an id recorded as free by the previous add is known not to be taken, so
+    # the new entry can be spliced in without parsing the file first
+    store = _cache.get(file)
+    if identifier == _read_next_identifier(file):
+        mtime = os.stat(file).st_mtime_ns
+        if append_json(file, key, entry):
+            if store is not None and store.mtime == mtime:
+                store.data[key] = entry
+                _update_cache(file, store.data)
+            _write_next_identifier(file, identifier + 1)
+            return
+
+    # an existing key can't be spliced in without leaving a duplicate, so the
+    # file is rewritten instead
     file_contents: dict = read_json(file)
-    file_contents[identifier] = {"quote": quote, "author": author}
 
-    with open(QUOTE_FILE, "w") as writer:
-        json.dump(file_contents, writer)
-        writer.close()
+    if file_contents and key not in file_contents and append_json(file, key, entry):
+        file_contents[key] = entry
+        _update_cache(file, file_contents)
+    else:
+        file_contents[key] = entry
+        write_json(file_contents, file)
+    _write_next_identifier(file, max(map(int, file_contents)) + 1)
+
+
+def _read_next_identifier(file: str) -> int | None:
+    """
+    Return the next free id recorded by the last add to `file`, or None if
+    the file has changed since
+    """
+    try:
+        stat = os.stat(file)
+        with open(os.path.join(CACHE_DIRECTORY, "next-id"), "r") as reader:
+            recorded_file, identifier = reader.read().rsplit("\n", 1)
+        if (
+            recorded_file
+            == f"{os.path.realpath(file)}\n{stat.st_mtime_ns}\n{stat.st_size}"
+        ):
+            return int(identifier)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _write_next_identifier(file: str, identifier: int) -> None:
+    """Record the next free id of `file` as of its current contents"""
+    try:
+        stat = os.stat(file)
+        os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+        with open(os.path.join(CACHE_DIRECTORY, "next-id"), "w") as writer:
+            writer.write(
+                f"{os.path.realpath(file)}\n{stat.st_mtime_ns}\n{stat.st_size}"
+                f"\n{identifier}"
+            )
+    except OSError:
+        pass
 
 
 def list_quotes(
-    quotes_list: list[Quote],
+    quotes_dict: dict[str, dict],
     show_duplicate_quotes: bool = False,
     author_filter: str | None = None,
-) -> list[str]:
-    seen_quotes: list[str] = []
-
-    for quote in quotes_list:
-        if author_filter and quote.author != author_filter:
+) -> None:
+    """
+    Print quotes straight from the parsed quote file without building a
+    Quote for each one. Duplicates are only printed if asked for.
+    """
+    unique_quotes: set[str] = set()
+
+    # lines are collected and written at once, as a terminal's stdout is line
+    # buffered and would otherwise be flushed for every quote
+    lines: list[str] = []
+
+    # bound methods are looked up once rather than on every iteration
+    add_line = lines.append
+    add_unique = unique_quotes.add
+
+    for identifier, entry in quotes_dict.items():
+        author: str = entry["author"] or ANONYMOUS
+        if author_filter and author != author_filter:
             continue
-        if quote.quote in seen_quotes and show_duplicate_quotes:
-            print(quote)
-        seen_quotes.append(quote.quote)
-    return seen_quotes
+        text: str = entry["quote"]
+        if show_duplicate_quotes or text not in unique_quotes:
+            add_line(f"Quote #{identifier}: {text} - {author}\n")
+        add_unique(text)
 
+    sys.stdout.write("".join(lines))
 
-def get_duplicate_quotes(quotes_list: list[Quote]) -> list[Quote] | None:
-    seen_quotes: list[str] = []
-    duplicate_quotes: list[Quote] = []
 
-    for quote in quotes_list:
-        if quote.quote in seen_quotes:
-            duplicate_quotes.append(quote)
-        seen_quotes.append(quote.quote)
-    return duplicate_quotes
+def get_duplicate_quotes(quotes_list: list[Quote]) -> list[Quote] | None:
+    """Return every repeat of an earlier quote, reusing the cached result if any"""
+    store = _find_store(quotes_list)
+    if store is not None:
+        return store.duplicates
+    return _find_duplicates(quotes_list)
+
+
+def _find_duplicates(quotes_list: list[Quote]) -> list[Quote]:
+    seen_quotes: set[str] = set()
+    add_seen = seen_quotes.add
+
+    # add_seen() returns None, so first occurrences are recorded but not kept
+    return [
+        quote
+        for quote in quotes_list
+        if (text := quote.quote) in seen_quotes or add_seen(text)
+    ]
 
 
 def write_pruned_quotes(
-    quotes_list: list[Quote], quotes_dict: dict, verbose: bool = False, file=QUOTE_FILE
-):
+    old_quotes: list[Quote] | dict[str, dict],
+    quotes_dict: dict[str, dict],
+    verbose: bool = False,
+    file: str = QUOTE_FILE,
+) -> None:
 
-    with open(file, "w") as writer:
-        json.dump(quotes_dict, writer)
-        writer.close()
+    write_json(quotes_dict, file)
 
-    quote_difference = get_quote_diff(quotes_list, quotes_dict)
+    quote_difference = get_quote_diff(old_quotes, quotes_dict)
     _print(
         verbose,
         f"Finished pruning quotes. ({quote_difference} duplicates)",
@@ -211,42 +569,142 @@ def write_pruned_quotes(
 
 
 def read_pruned_quotes(
-    quotes_dict: dict[int, str], verbose: bool = False
+    quotes_dict: dict[str, dict], verbose: bool = False
 ) -> dict | str:
-    quotes_list: list[Quote] = load_quotes()
-    duplicate_quotes: list[Quote] | None = get_duplicate_quotes(quotes_list)
-
-    if (
-        isinstance(duplicate_quotes, list) and len(duplicate_quotes) == 0
-    ) or duplicate_quotes is None:
+    """Keep the first occurrence of every quote, preserving file order"""
+    # the common case has nothing to prune, which a plain set can tell cheaply
+    unique_quotes: set[str] = {entry["quote"] for entry in quotes_dict.values()}
+    if len(unique_quotes) == len(quotes_dict):
         return "No duplicates found"
 
-    for index, duplicate in enumerate(duplicate_quotes):
-        _print(verbose, f"Removing quote #{duplicate.identifier}")
-        del quotes_dict[duplicate.identifier]
-    return quotes_dict
+    first_seen: dict[str, str] = {}
+    pruned_quotes: dict[str, dict] = {
+        identifier: entry
+        for identifier, entry in quotes_dict.items()
+        if first_seen.setdefault(entry["quote"], identifier) == identifier
+    }
+
+    for identifier in quotes_dict:
+        if identifier not in pruned_quotes:
+            _print(verbose, f"Removing quote #{identifier}")
+    return pruned_quotes
+
+
+def index_quotes(
+    quotes_list: list[Quote],
+) -> tuple[dict[int, Quote], dict[str, list[Quote]]]:
+    """Map identifiers and authors to quotes, reusing the cached index if any"""
+    store = _find_store(quotes_list)
+    if store is not None:
+        return store.index
+    return _build_index(quotes_list)
+
+
+def _build_index(
+    quotes_list: list[Quote],
+) -> tuple[dict[int, Quote], dict[str, list[Quote]]]:
+    quotes_by_id: dict[int, Quote] = {}
+    quotes_by_author: dict[str, list[Quote]] = defaultdict(list)
+    for quote in quotes_list:
+        quotes_by_id.setdefault(quote.identifier, quote)
+        quotes_by_author[quote.author].append(quote)
+    return quotes_by_id, quotes_by_author
 
 
 def query_quote(
-    quotes_list: list[Quote], quote_identifier: int | None, quote_author: str | None
+    quotes_list: list[Quote], identifier: int | None, author: str | None
 ) -> Quote | None:
-    if quote_identifier is not None:
-        for quote in quotes_list:
-            if int(quote.identifier) == int(quote_identifier):
-                return quote
-    if quote_author is not None:
-        selected_quotes: list[Quote] = []
-        for quote in quotes_list:
-            if quote.author == quote_author:
-                selected_quotes.append(quote)
-        return random_quote(selected_quotes)
+    quotes_by_id, quotes_by_author = index_quotes(quotes_list)
+
+    if identifier is not None:
+        quote = quotes_by_id.get(int(identifier))
+        if quote is not None:
+            return quote
+    if author is not None:
+        return random_quote(quotes_by_author.get(author, []))
 
     # no identifier or author
     return None
 
 
+def _read_ref(git_directory: str, ref: str) -> str | None:
+    """Return the commit a ref points at, whether it is loose or packed"""
+    try:
+        with open(os.path.join(git_directory, ref), "r") as reader:
+            return reader.read().strip()
+    except OSError:
+        pass
+
+    try:
+        with open(os.path.join(git_directory, "packed-refs"), "r") as reader:
+            for line in reader:
+                commit, _, name = line.rstrip("\n").partition(" ")
+                if name == ref:
+                    return commit
+    except OSError:
+        pass
+    return None
+
+
+def _describe_key(git_directory: str) -> str | None:
+    """
+    Return a key for everything `git describe` depends on: the commit HEAD
+    resolves to and every tag ref, including nested and packed ones
+    """
+    try:
+        with open(os.path.join(git_directory, "HEAD"), "r") as reader:
+            head: str = reader.read().strip()
+    except OSError:
+        return None
+
+    commit: str | None = head
+    if head.startswith("ref: "):
+        commit = _read_ref(git_directory, head.removeprefix("ref: "))
+    if not commit:
+        return None
+
+    tags: list[str] = []
+    tag_directory = os.path.join(git_directory, "refs", "tags")
+    for directory, _, files in os.walk(tag_directory):
+        for name in files:
+            path = os.path.join(directory, name)
+            try:
+                with open(path, "r") as reader:
+                    tag = reader.read().strip()
+            except OSError:
+                continue
+            tags.append(f"{os.path.relpath(path, tag_directory)} {tag}")
+
+    try:
+        packed_refs: int | None = os.stat(
+            os.path.join(git_directory, "packed-refs")
+        ).st_mtime_ns
+    except OSError:
+        packed_refs = None
+
+    return "\n".join([git_directory, commit, str(packed_refs), *sorted(tags)])
+
+
 def get_version() -> str:
-    """Return most recent tag read from stdout with git"""
+    """
+    Return most recent tag read from stdout with git, reusing the tag cached
+    by a previous run unless HEAD or the repository's tags have changed since
+    """
+    describe_key = _describe_key(os.path.abspath(".git"))
+    cache_file = os.path.join(CACHE_DIRECTORY, "version")
+
+    if describe_key is not None:
+        try:
+            with open(cache_file, "r") as reader:
+                cached = reader.read()
+            if cached.startswith(describe_key + "\n\n"):
+                return cached[len(describe_key) + 2 :]
+        except OSError:
+            pass
+
+    import subprocess
+    from shutil import which
+
     git_path = which("git")
 
     if git_path is None:
@@ -256,19 +714,27 @@ def get_version() -> str:
         ["git", "describe", "--abbrev=0"],
         encoding="utf8",
         stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
     )
 
     if tag_process.returncode > 0:
         return tag_process.stderr
-    else:
-        return tag_process.stdout
+
+    if describe_key is not None:
+        try:
+            os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+            with open(cache_file, "w") as writer:
+                writer.write(f"{describe_key}\n\n{tag_process.stdout}")
+        except OSError:
+            pass
+    return tag_process.stdout
 
 
 def update_changes(
     force: bool = False,
     check_dev: bool = True,
     verbose: bool = False,
-):
+) -> None:
     initial_working_directory = os.getcwd()
     _print(verbose, "Changing CWD to root (/)\nReverting after call.")
     os.chdir("/")
@@ -276,70 +742,88 @@ def update_changes(
     os.chdir(initial_working_directory)
 
 
-def get_quote_diff(old_list: list[Quote], new_dict: dict[str, Quote]) -> int:
+def get_quote_diff(
+    old_list: list[Quote] | dict[str, dict], new_dict: dict[str, dict]
+) -> int:
     """Find the difference in value between an old and new quote file"""
 
     quote_difference = len(old_list) - len(new_dict.keys())
     return quote_difference
 
 
-def main():
-    parser: Parser = Parser()
-    quotes_list: list[Quote] = load_quotes()
-    quote_file: str = parser.args.file if parser.args.file is not None else QUOTE_FILE
-
-    match parser.args.command:
-        case "qotd":
-            quote = random_quote(quotes_list)
-            if quote is not None:
-                print(quote)
-            else:
-                _print(parser.args.verbose, "Couldn't find any quotes! :'(")
-
-        case "query":
-            if parser.args.list:
-                list_quotes(
-                    quotes_list,
-                    show_duplicate_quotes=parser.args.show_duplicates,
-                    author_filter=parser.args.author,
-                )
-            else:
-                quote = query_quote(quotes_list, parser.args.id, parser.args.author)
-                print(quote)
+def run_qotd(args: argparse.Namespace, quote_file: str) -> None:
+    quote = random_quote(load_quotes(quote_file))
+    if quote is not None:
+        print(quote)
+    else:
+        _print(args.verbose, "Couldn't find any quotes! :'(")
 
-        case "add":
-            add_quote(
-                parser.args.quote, parser.args.author, len(quotes_list), file=quote_file
-            )
-            _print(parser.args.verbose, f"Added quote #{len(quotes_list)-1}.")
 
-        case "prune":
-            pruned_quotes: str | dict[str, Quote] = read_pruned_quotes(
-                read_json(file=quote_file), parser.args.verbose
-            )
-            quotes_is_dict = isinstance(pruned_quotes, dict)
-            if quotes_is_dict:
-                write_pruned_quotes(quotes_list, pruned_quotes, parser.args.verbose)
-            elif quotes_is_dict is False:
-                _print(parser.args.verbose, pruned_quotes)
-
-        case "version":
-            current_version = get_version()
-            print(current_version)
-
-        case "update":
-            update_changes(
-                parser.args.force, parser.args.check_dev, parser.args.verbose
-            )
+def run_query(args: argparse.Namespace, quote_file: str) -> None:
+    if args.id is not None:
+        print(get_quote(args.id, file=quote_file))
+    elif args.list or args.show_duplicates:
+        list_quotes(
+            read_json(quote_file),
+            show_duplicate_quotes=args.show_duplicates,
+            author_filter=args.author,
+        )
+    else:
+        quote = query_quote(load_quotes(quote_file), args.id, args.author)
+        print(quote)
 
-        case _:
-            _print(
-                verbose=True,
-                msg="Couldn't locate the source or origin of the specified command.",
-            )
 
+def run_add(args: argparse.Namespace, quote_file: str) -> None:
+    identifier = _read_next_identifier(quote_file)
+    if identifier is None:
+        # pruning can leave gaps in the ids, so the count may already be taken
+        identifier = max(map(int, read_json(quote_file)), default=-1) + 1
+    add_quote(args.quote, args.author, identifier, file=quote_file)
+    _print(args.verbose, f"Added quote #{identifier}.")
 
-sys.exit()
+
+def run_prune(args: argparse.Namespace, quote_file: str) -> None:
+    quotes_dict: dict[str, dict] = read_json(file=quote_file)
+    pruned_quotes: str | dict[str, dict] = read_pruned_quotes(quotes_dict, args.verbose)
+    if isinstance(pruned_quotes, dict):
+        write_pruned_quotes(quotes_dict, pruned_quotes, args.verbose, file=quote_file)
+    else:
+        _print(args.verbose, pruned_quotes)
+
+
+def run_version(args: argparse.Namespace, quote_file: str) -> None:
+    current_version = get_version()
+    print(current_version)
+
+
+def run_update(args: argparse.Namespace, quote_file: str) -> None:
+    update_changes(args.force, args.check_dev, args.verbose)
+
+
+# command name -> function that runs it, with the parsed arguments and quote file
+COMMANDS = {
+    "qotd": run_qotd,
+    "query": run_query,
+    "add": run_add,
+    "prune": run_prune,
+    "version": run_version,
+    "update": run_update,
+}
+
+
+def main() -> None:
+    parser: Parser = Parser()
+    args: argparse.Namespace = parser.args
+    quote_file: str = args.file if args.file is not None else QUOTE_FILE
+
+    command = COMMANDS.get(args.command)
+    if command is None:
+        _print(
+            verbose=True,
+            msg="Couldn't locate the source or origin of the specified command.",
+        )
+        return
+    command(args, quote_file)
 
 
 if __name__ == "__main__":
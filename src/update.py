@@ -29,8 +29,6 @@ THIS IS A MODIFIED VERSION OF THE ORIGINAL SCRIPT TO SUIT QUOTE AS A PROGRAM.
 import inspect
 import os
 
-import git
-
 
 def __print(verbose, msg):
     """
@@ -76,6 +74,8 @@ def __find_repo(verbose=False):
     location of the base of the git repo. If the script is not, a
     LookupError is raised to indicate it could not find the repo
     """
+    import git
+
     file_path, file_name = __get_calling_file()
     # walk up the file tree looking for a valid git repo, stop when we hit the base
     while True:
@@ -100,6 +100,8 @@ def __find_current_branch(repo, verbose=False):
     If for some reason the function fails to find the current branch
     an IOError is raised to indicate something has gone wrong.
     """
+    import git
+
     assert (
         type(repo) is git.Repo
     ), "Passed in repo needs to be of type 'git.repo.base.Repo'"
@@ -159,6 +161,8 @@ def __get_file_conflicts(repo, verbose=False):
     and returns a list of files that have conflicts with
     the remote repo.
     """
+    import git
+
     assert (
         type(repo) is git.Repo
     ), "Passed in repo needs to be of type 'git.repo.base.Repo'"
@@ -179,6 +183,8 @@ def __get_file_diffs(repo, verbose=False):
     and returns a list of files that contain changes
     between the remote and local repo.
     """
+    import git
+
     assert (
         type(repo) is git.Repo
     ), "Passed in repo needs to be of type 'git.repo.base.Repo'"
@@ -212,6 +218,8 @@ def pull(force=False, check_dev=True, verbose=False):
     it does not handle a git error correctly in which case it will be
     raised again to be potentially handled higher up.
     """
+    import git
+
     repo_path = __find_repo()
     repo = git.Repo(repo_path)
     if not force:
@@ -280,6 +288,8 @@ def push(
     that are protected with 2-factor authentication. It is reccomended to
     clone the repo using SSH to avoid issues in this case.
     """
+    import git
+
     repo_path = __find_repo()
     if check_dev and __is_dev_env(repo_path) and force:
         __print(verbose, "Detected development environment. Aborting hard pull")
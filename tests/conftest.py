@@ -9,6 +9,13 @@ def test_version_exists():
     assert isinstance(version, str) and version != ""
 
 
+# keeps anything cached by the code under test out of the user's cache
+@pytest.fixture(autouse=True)
+def cache_directory(tmp_path, monkeypatch) -> str:
+    monkeypatch.setattr(main, "CACHE_DIRECTORY", str(tmp_path / "cache"))
+    return str(tmp_path / "cache")
+
+
 @pytest.fixture
 def quote_hashmap() -> dict:
     return main.read_json(file="tests/data/quotes.json")
@@ -13,6 +13,288 @@ def test_query_identifier(quote_list):
 
 
 @pytest.mark.git
-def test_version_exists():
+def test_version_exists(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "CACHE_DIRECTORY", str(tmp_path))
     version = main.get_version()
     assert isinstance(version, str) and version != ""
+
+
+def test_read_json_cached(quote_hashmap):
+    assert main.read_json(file="tests/data/quotes.json") is quote_hashmap
+
+
+def test_add_quote_updates_cache(tmp_path):
+    quote_file = str(tmp_path / "quotes.json")
+    main.add_quote("some quote", "john smith", 0, file=quote_file)
+
+    quotes_list = main.load_quotes(file=quote_file)
+    assert [quote.quote for quote in quotes_list] == ["some quote"]
+
+
+def test_stdlib_json_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "orjson", None)
+    quote_file = str(tmp_path / "quotes.json")
+    main.add_quote("some quote", "john smith", 0, file=quote_file)
+    main._cache.clear()
+
+    assert main.read_json(file=quote_file) == {
+        "0": {"quote": "some quote", "author": "john smith"}
+    }
+
+
+def test_add_quote_appends(tmp_path):
+    quote_file = tmp_path / "quotes.json"
+    quote_file.write_text('{"0": {"quote": "some quote", "author": "john smith"}}\n')
+
+    main.add_quote("another quote", "Anonymous", 1, file=str(quote_file))
+    main.add_quote("a third quote", "Anonymous", 2, file=str(quote_file))
+    main._cache.clear()
+
+    quotes_list = main.load_quotes(file=str(quote_file))
+    assert [quote.identifier for quote in quotes_list] == [0, 1, 2]
+
+
+def test_add_quote_existing_identifier(tmp_path):
+    quote_file = tmp_path / "quotes.json"
+    quote_file.write_text('{"0": {"quote": "some quote", "author": "john smith"}}\n')
+
+    main.add_quote("another quote", "Anonymous", 0, file=str(quote_file))
+    main._cache.clear()
+
+    assert main.read_json(file=str(quote_file)) == {
+        "0": {"quote": "another quote", "author": "Anonymous"}
+    }
+
+
+def test_run_add_after_prune(tmp_path, monkeypatch):
+    quote_file = tmp_path / "quotes.json"
+    quote_file.write_text(
+        '{"0": {"quote": "first", "author": null},'
+        ' "1": {"quote": "second", "author": null},'
+        ' "3": {"quote": "third", "author": null}}\n'
+    )
+    monkeypatch.setattr(
+        main.sys, "argv", ["main.py", "--file", str(quote_file), "add", "fourth"]
+    )
+    main.main()
+    main._cache.clear()
+
+    assert list(main.read_json(file=str(quote_file))) == ["0", "1", "3", "4"]
+
+
+def test_add_quote_skips_parse(tmp_path, monkeypatch):
+    quote_file = str(tmp_path / "quotes.json")
+    main.add_quote("some quote", "john smith", 0, file=quote_file)
+    main._cache.clear()
+
+    read_json = main.read_json
+
+    def fail(file):
+        raise AssertionError("quote file was parsed")
+
+    monkeypatch.setattr(main, "read_json", fail)
+    main.add_quote("another quote", "john smith", 1, file=quote_file)
+
+    assert list(read_json(file=quote_file)) == ["0", "1"]
+
+
+def test_next_identifier_invalidated(tmp_path):
+    quote_file = tmp_path / "quotes.json"
+    main.add_quote("some quote", "john smith", 0, file=str(quote_file))
+    assert main._read_next_identifier(str(quote_file)) == 1
+
+    quote_file.write_text('{"5": {"quote": "edited", "author": null}}\n')
+    assert main._read_next_identifier(str(quote_file)) is None
+
+
+def test_parser_builds_selected_command(monkeypatch):
+    monkeypatch.setattr(
+        main.sys, "argv", ["main.py", "--file", "quotes.json", "update", "--force"]
+    )
+    parser = main.Parser()
+
+    assert list(parser.parsers) == ["update"]
+    assert parser.args.command == "update" and parser.args.force
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--file", "quotes.json", "query", "--id", "1"],
+        ["query", "--author", "Eminem"],
+        ["--verbose", "query", "--show-duplicates"],
+        ["add", "some quote"],
+        ["add", "some quote", "--author", "Eminem"],
+    ],
+)
+def test_parser_simple_args(monkeypatch, argv):
+    monkeypatch.setattr(main.sys, "argv", ["main.py", *argv])
+    simple_args = main.Parser().args
+    monkeypatch.setattr(main.Parser, "_parse_simple_args", staticmethod(lambda _: None))
+    assert simple_args == main.Parser().args
+
+
+def test_duplicate_quotes(quote_list):
+    duplicate_quotes = main.get_duplicate_quotes(quote_list)
+    assert [quote.identifier for quote in duplicate_quotes] == [4]
+
+
+def test_query_author(quote_list):
+    quote: main.Quote | None = main.query_quote(quote_list, None, author="Eminem")
+    assert quote is not None and quote.identifier == 2
+    assert main.query_quote(quote_list, None, author="Nobody") is None
+
+
+def test_read_pruned_quotes(quote_list):
+    quotes_dict = main.read_json(file="tests/data/quotes.json")
+    pruned_quotes = main.read_pruned_quotes(quotes_dict)
+
+    assert isinstance(pruned_quotes, dict) and "4" not in pruned_quotes
+    assert main.get_quote_diff(quote_list, pruned_quotes) == 1
+
+
+def test_get_quote(quote_list):
+    quote: main.Quote | None = main.get_quote(2, file="tests/data/quotes.json")
+    assert quote == main.query_quote(quote_list, identifier=2, author=None)
+    assert main.get_quote(99, file="tests/data/quotes.json") is None
+
+
+def test_write_json_replaces_file(tmp_path):
+    quote_file = tmp_path / "quotes.json"
+    quote_file.write_text("{}")
+
+    main.write_json(
+        {"0": {"quote": "some quote", "author": "john smith"}}, str(quote_file)
+    )
+
+    assert [path.name for path in tmp_path.iterdir()] == ["quotes.json"]
+    assert main.read_json(file=str(quote_file))["0"]["quote"] == "some quote"
+
+
+def test_write_json_symlink(tmp_path):
+    real_file = tmp_path / "real.json"
+    real_file.write_text("{}")
+    real_file.chmod(0o600)
+    quote_file = tmp_path / "quotes.json"
+    quote_file.symlink_to(real_file)
+
+    main.write_json(
+        {"0": {"quote": "some quote", "author": "john smith"}}, str(quote_file)
+    )
+
+    assert quote_file.is_symlink()
+    assert real_file.stat().st_mode & 0o777 == 0o600
+    assert '"some quote"' in real_file.read_text()
+
+
+def test_write_json_failure_removes_temporary_file(tmp_path, monkeypatch):
+    quote_file = tmp_path / "quotes.json"
+    quote_file.write_text("{}")
+
+    def fail(source, destination):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(main.os, "replace", fail)
+    with pytest.raises(OSError):
+        main.write_json({}, str(quote_file))
+
+    assert [path.name for path in tmp_path.iterdir()] == ["quotes.json"]
+
+
+def test_quote_has_no_dict(quote_list):
+    assert not hasattr(quote_list[0], "__dict__")
+
+
+def test_version_cached(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, "CACHE_DIRECTORY", str(tmp_path / "cache"))
+    git_directory = tmp_path / ".git"
+    (git_directory / "refs" / "heads").mkdir(parents=True)
+    (git_directory / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_directory / "refs" / "heads" / "main").write_text("a" * 40 + "\n")
+    describe_key = main._describe_key(str(git_directory))
+    (tmp_path / "cache").mkdir()
+    (tmp_path / "cache" / "version").write_text(f"{describe_key}\n\nv1.0.0\n")
+
+    assert main.get_version() == "v1.0.0\n"
+
+
+def test_describe_key_nested_refs(tmp_path):
+    git_directory = tmp_path / ".git"
+    (git_directory / "refs" / "heads" / "feature").mkdir(parents=True)
+    (git_directory / "HEAD").write_text("ref: refs/heads/feature/x\n")
+    (git_directory / "refs" / "heads" / "feature" / "x").write_text("a" * 40 + "\n")
+    describe_key = main._describe_key(str(git_directory))
+
+    (git_directory / "refs" / "heads" / "feature" / "x").write_text("b" * 40 + "\n")
+    assert main._describe_key(str(git_directory)) != describe_key
+    describe_key = main._describe_key(str(git_directory))
+
+    (git_directory / "refs" / "tags" / "release").mkdir(parents=True)
+    (git_directory / "refs" / "tags" / "release" / "v2").write_text("b" * 40 + "\n")
+    assert main._describe_key(str(git_directory)) != describe_key
+
+
+def test_describe_key_packed_head(tmp_path):
+    git_directory = tmp_path / ".git"
+    git_directory.mkdir()
+    (git_directory / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_directory / "packed-refs").write_text(f"{'c' * 40} refs/heads/main\n")
+
+    assert ("c" * 40) in main._describe_key(str(git_directory)).split("\n")
+
+
+def test_list_quotes(quote_hashmap, capsys):
+    main.list_quotes(quote_hashmap, author_filter="john smith")
+    assert capsys.readouterr().out == "Quote #3: some quote - john smith\n"
+
+    main.list_quotes(
+        quote_hashmap, show_duplicate_quotes=True, author_filter="john smith"
+    )
+    assert capsys.readouterr().out.count("some quote") == 2
+
+
+def test_read_json_missing_file(tmp_path):
+    quote_file = tmp_path / "quotes.json"
+    assert main.read_json(file=str(quote_file)) == {}
+    assert not quote_file.exists()
+
+
+def test_duplicate_quotes_cached(quote_list):
+    assert main.get_duplicate_quotes(quote_list) is main.get_duplicate_quotes(
+        quote_list
+    )
+
+
+def test_replaced_store_forgotten(tmp_path):
+    quote_file = str(tmp_path / "quotes.json")
+    main.add_quote("some quote", "john smith", 0, file=quote_file)
+    quotes_list = main.load_quotes(file=quote_file)
+    assert main._find_store(quotes_list) is main._cache[quote_file]
+
+    main.add_quote("another quote", "john smith", 1, file=quote_file)
+    assert main._find_store(quotes_list) is None
+
+
+def test_random_quote(quote_list):
+    assert main.random_quote(quote_list) in quote_list
+    assert main.random_quote([]) is None
+
+
+def test_read_pruned_quotes_no_duplicates():
+    quotes_dict = {"0": {"quote": "some quote", "author": "john smith"}}
+    assert main.read_pruned_quotes(quotes_dict) == "No duplicates found"
+
+
+def test_load_quotes_interns_authors(tmp_path):
+    # written directly so the authors come from a fresh parse, not the cache
+    quote_file = tmp_path / "quotes.json"
+    quote_file.write_text(
+        '{"0": {"quote": "some quote", "author": "john smith"},'
+        ' "1": {"quote": "another quote", "author": "john smith"},'
+        ' "2": {"quote": "a third quote", "author": null}}\n'
+    )
+
+    first, second, third = main.load_quotes(file=str(quote_file))
+    assert first.author is second.author
+    assert third.author == "Anonymous"